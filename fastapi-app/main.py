@@ -1,20 +1,96 @@
-from fastapi import FastAPI, HTTPException, Query
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, Query
+from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi import Request
-from pydantic import BaseModel, field_validator, Field
-from typing import List, Optional
-from datetime import date as _date
-import json
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ValidationError, WithJsonSchema, field_validator, Field
+from typing import Annotated, List, Literal, Optional
+from datetime import date as _date, datetime, time as _time, timedelta
+from contextlib import asynccontextmanager, contextmanager
+from functools import lru_cache
+import asyncio
 import os
+import re
+import sqlite3
+import threading
+import time
+import orjson
+import xxhash
 from pathlib import Path
 from prometheus_fastapi_instrumentator import Instrumentator
 
 APP_VERSION = "6.0.0"
 NOT_FOUND_MSG = "To-Do item not found"
-TODAY = _date.today().isoformat()
+_TODAY = {"value": "", "until": 0.0}
 
-app = FastAPI(title="Todo App", version=APP_VERSION)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 시작 시 DB 준비 (첫 실행이면 todo.json 가져오기) + data_version 확인용 연결 열기
+    await asyncio.to_thread(_open_probe)
+    try:
+        yield
+    finally:
+        _close_all()
+
+RESPONSE_CACHE_TTL = 5.0  # 캐시된 GET 응답의 최대 보관 시간(초)
+RESPONSE_CACHE_MAX = 1024
+
+class TodoCacheMiddleware:
+    # GET /todos, /todos/{id} 응답을 (path, query) 단위로 메모리에 보관
+    # 항목의 ETag가 현재 상태 기준 ETag와 같을 때만 재사용 → 어느 연결의 커밋이든 즉시 무효화됨
+    def __init__(self, app):
+        self.app = app
+        self.entries: dict[tuple[str, bytes], tuple[str, float, dict]] = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET" or not scope["path"].startswith("/todos"):
+            await self.app(scope, receive, send)
+            return
+        # 조건부 요청(If-None-Match)은 엔드포인트가 304로 처리
+        if any(k == b"if-none-match" for k, _ in scope["headers"]):
+            await self.app(scope, receive, send)
+            return
+
+        key = (scope["path"], scope["query_string"])
+        hit = self.entries.get(key)
+        # 상태 토큰은 요청당 한 번만 계산 (miss면 엔드포인트가 같은 값을 재사용)
+        if hit is not None and hit[1] > time.monotonic() and etag_is_current(key, hit[0], request_token(scope)):
+            start, body = hit[2]["start"], hit[2]["body"]
+            # 바깥 미들웨어가 헤더 리스트를 수정해도 보관본은 그대로 두도록 사본 전송
+            await send({**start, "headers": list(start["headers"])})
+            await send(body)
+            return
+
+        captured = {}
+        chunks: list[bytes] = []
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                # 바깥 미들웨어(CORS 등)가 헤더를 덧붙이기 전 사본을 보관
+                captured["start"] = {**message, "headers": list(message.get("headers", []))}
+            elif message["type"] == "http.response.body":
+                # 여러 조각(more_body=True)으로 온 본문은 모아서 하나의 메시지로 보관
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    captured["body"] = {"type": "http.response.body", "body": b"".join(chunks)}
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+        start = captured.get("start")
+        if start is None or "body" not in captured or start["status"] != 200:
+            return
+        etag = next((v.decode() for k, v in start.get("headers", []) if k.lower() == b"etag"), None)
+        if etag is None:
+            return
+        if len(self.entries) >= RESPONSE_CACHE_MAX:
+            self.entries.clear()
+        self.entries[key] = (etag, time.monotonic() + RESPONSE_CACHE_TTL, captured)
+
+app = FastAPI(title="Todo App", version=APP_VERSION, lifespan=lifespan)
+
+# 가장 안쪽에 등록 → 캐시 hit에도 CORS/메트릭/버전 헤더는 그대로 적용
+app.add_middleware(TodoCacheMiddleware)
 
 # Prometheus 메트릭스 엔드포인트 (/metrics)
 Instrumentator().instrument(app).expose(app, endpoint="/metrics")
@@ -29,15 +105,40 @@ app.add_middleware(
 # --- Paths (절대경로 안전화) ---
 BASE_DIR = Path(__file__).resolve().parent
 TODO_FILE = Path(os.getenv("TODO_FILE", str(BASE_DIR / "todo.json")))
+TODO_DB = os.getenv("TODO_DB")  # 미지정 시 TODO_FILE 옆의 todo.db
 INDEX_HTML = BASE_DIR / "templates" / "index.html"
 
+# 오늘 날짜(로컬) 문자열: 다음 자정까지 캐시 → 장기 실행 프로세스도 날짜가 넘어가면 갱신
+def today() -> str:
+    now = time.time()
+    if now >= _TODAY["until"]:
+        d = _date.today()
+        _TODAY["value"] = d.isoformat()
+        _TODAY["until"] = datetime.combine(d + timedelta(days=1), _time.min).timestamp()
+    return _TODAY["value"]
+
 # --- Model & Validation ---
+_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+# SQLite INTEGER 범위. 생성 시에는 검증 오류, 조회/수정/삭제에서는 저장될 수 없는 id이므로 404
+_ID_MIN, _ID_MAX = -(2**63), 2**63 - 1
+
+# 같은 날짜 문자열(대부분 오늘)이 반복되므로 검증 결과를 캐시
+@lru_cache(maxsize=1024)
+def _is_valid_date(v: str) -> bool:
+    if not _DATE_RE.match(v):
+        return False
+    try:
+        _date.fromisoformat(v)
+    except ValueError:
+        return False
+    return True
+
 class TodoItem(BaseModel):
-    id: int
+    id: int = Field(ge=_ID_MIN, le=_ID_MAX)
     title: str
     description: str
     completed: bool = False
-    date: str = Field(default_factory=lambda: _date.today().isoformat())
+    date: str = Field(default_factory=today)
 
     @field_validator("title", "description")
     @classmethod
@@ -50,10 +151,7 @@ class TodoItem(BaseModel):
     @classmethod
     def valid_date(cls, v: str) -> str:
         # YYYY-MM-DD 형식 검증
-        try:
-            y, m, d = map(int, v.split("-"))
-            _ = _date(y, m, d)
-        except Exception:
+        if not _is_valid_date(v):
             raise ValueError("date must be YYYY-MM-DD")
         return v
     
@@ -63,125 +161,464 @@ class DateOnly(BaseModel):
     @field_validator("date")
     @classmethod
     def valid_date(cls, v: str) -> str:
-        try:
-            y, m, d = map(int, v.split("-"))
-            _ = _date(y, m, d)
-        except Exception:
+        if not _is_valid_date(v):
             raise ValueError("date must be YYYY-MM-DD")
         return v
 
-# --- Storage helpers ---
+class BatchOp(BaseModel):
+    op: Literal["create", "update", "delete", "patch_date"]
+    id: int
+    # create/update: TodoItem 형식. 작업별 상태를 돌려주기 위해 dict로 받고 적용 시점에 항목별 검증
+    data: Annotated[Optional[dict], WithJsonSchema(TodoItem.model_json_schema())] = None
+    date: Optional[str] = None       # patch_date (형식 검증은 적용 시점에 항목별로)
+
+class BatchRequest(BaseModel):
+    ops: List[BatchOp]
+
+# model_dump()보다 가벼운 직접 변환 (serializer 디스패치 없음)
+def _to_dict(t: TodoItem) -> dict:
+    return {"id": t.id, "title": t.title, "description": t.description, "completed": t.completed, "date": t.date}
+
+class OrjsonResponse(JSONResponse):
+    # 이미 검증된 dict/list를 재검증 없이 orjson으로 바로 직렬화
+    # (fastapi.responses.ORJSONResponse는 deprecated)
+    def render(self, content) -> bytes:
+        return orjson.dumps(content)
+
+# --- Request body ---
+# 요청 본문을 bytes 그대로 모아 orjson으로 한 번만 파싱한 뒤 모델 검증
+# (FastAPI 기본 경로는 body() + stdlib json.loads를 거침) 오류 형식은 FastAPI의 422와 동일
+async def read_model(request: Request, model: type[BaseModel]):
+    buf = bytearray()
+    async for chunk in request.stream():
+        buf += chunk
+    try:
+        data = orjson.loads(buf)
+    except orjson.JSONDecodeError as e:
+        raise RequestValidationError(
+            [{"type": "json_invalid", "loc": ("body", e.pos), "msg": "JSON decode error", "input": {}, "ctx": {"error": e.msg}}]
+        )
+    try:
+        return model.model_validate(data)
+    except ValidationError as e:
+        raise RequestValidationError([{**err, "loc": ("body", *err["loc"])} for err in e.errors(include_url=False)])
+
+# OpenAPI 문서에 요청 본문 스키마 표시 (핸들러가 Request를 직접 받으므로 수동 지정)
+# 중첩 모델($defs)은 components/schemas로 옮겨 문서 루트 기준 $ref가 풀리도록 함
+_BODY_SCHEMAS: dict = {}
+
+def json_body(model: type[BaseModel]) -> dict:
+    schema = model.model_json_schema(ref_template="#/components/schemas/{model}")
+    _BODY_SCHEMAS.update(schema.pop("$defs", {}))
+    return {"requestBody": {"required": True, "content": {"application/json": {"schema": schema}}}}
+
+_base_openapi = app.openapi
+
+def _openapi() -> dict:
+    schema = _base_openapi()
+    components = schema.setdefault("components", {}).setdefault("schemas", {})
+    for name, definition in _BODY_SCHEMAS.items():
+        components.setdefault(name, definition)
+    return schema
+
+app.openapi = _openapi
+
+# --- Storage (SQLite) ---
+# todos 테이블이 원본 데이터. todo.json은 DB를 처음 만들 때 한 번만 가져옴
+# WAL 모드: 읽기와 쓰기가 서로 막지 않고, 커밋은 WAL 파일 끝에 추가만 함
+# 다른 연결/프로세스의 커밋은 PRAGMA data_version으로 감지 (ETag 메모 무효화)
+_SCHEMA = "CREATE TABLE IF NOT EXISTS todos(id INTEGER PRIMARY KEY, title TEXT, description TEXT, completed INTEGER, date TEXT)"
+_COLUMNS = "id, title, description, completed, date"
+_INSERT = f"INSERT INTO todos({_COLUMNS}) VALUES (?, ?, ?, ?, ?)"
+_LOCAL = threading.local()  # 스레드별 연결
+_CONNS: list[sqlite3.Connection] = []
+_CONNS_LOCK = threading.Lock()
+# epoch: _close_all 때마다 증가 → 스레드별 연결을 다시 엶
+_STATE = {"epoch": 0}
+# data_version 확인 전용 연결 (값은 같은 연결끼리만 비교 가능하므로 스레드 간 공유)
+# 이 연결은 쓰지 않으므로 이 프로세스의 커밋을 포함한 모든 커밋에 값이 바뀜
+_PROBE: dict = {"key": None, "conn": None}
+_PROBE_LOCK = threading.Lock()
+
+def _db_file() -> Path:
+    return Path(TODO_DB) if TODO_DB else TODO_FILE.with_suffix(".db")
+
+def _row(cursor, row) -> dict:
+    return {"id": row[0], "title": row[1], "description": row[2], "completed": bool(row[3]), "date": row[4]}
+
+def _values(t: dict, default_date: str) -> tuple:
+    return (t["id"], t.get("title", ""), t.get("description", ""), int(bool(t.get("completed", False))),
+            t.get("date") or default_date)
+
+def _conn() -> sqlite3.Connection:
+    key = (str(_db_file()), _STATE["epoch"])
+    c = getattr(_LOCAL, "conn", None)
+    if c is not None and _LOCAL.key == key:
+        return c
+    # isolation_level=None: 트랜잭션은 _tx에서 직접 BEGIN/COMMIT
+    # check_same_thread=False: 종료 시 다른 스레드에서 close 하기 위함 (사용은 스레드별)
+    c = sqlite3.connect(key[0], isolation_level=None, check_same_thread=False)
+    c.execute("PRAGMA journal_mode=WAL")
+    c.execute("PRAGMA synchronous=NORMAL")
+    _migrate(c)
+    c.row_factory = _row
+    _LOCAL.conn, _LOCAL.key = c, key
+    with _CONNS_LOCK:
+        _CONNS.append(c)
+    return c
+
+def _close_all() -> None:
+    with _CONNS_LOCK:
+        for c in _CONNS:
+            c.close()
+        _CONNS.clear()
+        _STATE["epoch"] += 1
+
+@contextmanager
+def _tx(c: sqlite3.Connection):
+    c.execute("BEGIN IMMEDIATE")
+    try:
+        yield c
+        c.execute("COMMIT")
+    except BaseException:
+        # COMMIT 실패(SQLITE_BUSY 등)도 롤백 → 트랜잭션이 열린 채 연결에 남지 않음
+        if c.in_transaction:
+            c.execute("ROLLBACK")
+        raise
+
+# lifespan에서 worker 스레드로 호출. DB 준비(_conn: WAL + 마이그레이션) 후 확인용 연결을 엶
+def _open_probe() -> sqlite3.Connection:
+    key = (str(_db_file()), _STATE["epoch"])
+    _conn()
+    with _PROBE_LOCK:
+        if _PROBE["key"] != key:
+            c = sqlite3.connect(key[0], isolation_level=None, check_same_thread=False)
+            _PROBE.update(key=key, conn=c)
+            with _CONNS_LOCK:
+                _CONNS.append(c)
+        return _PROBE["conn"]
+
+def _data_version() -> int:
+    c = _PROBE["conn"]
+    if _PROBE["key"] != (str(_db_file()), _STATE["epoch"]):
+        # lifespan 없이 실행되었거나 DB 경로가 바뀐 경우에만 여기서 엶
+        c = _open_probe()
+    with _PROBE_LOCK:
+        return c.execute("PRAGMA data_version").fetchone()[0]
+
+def _storable(todo_id: int) -> bool:
+    return _ID_MIN <= todo_id <= _ID_MAX
+
+def _read_json_file() -> list[dict]:
+    try:
+        return orjson.loads(TODO_FILE.read_bytes())
+    except FileNotFoundError:
+        return []
+    except orjson.JSONDecodeError:
+        # 손상된 파일 방어
+        return []
+
+def _migrate(c: sqlite3.Connection) -> None:
+    # user_version 0 = 새 DB → 테이블 생성 + 기존 JSON 가져오기 (날짜 없는 구데이터는 오늘 날짜로)
+    # 이미 준비된 DB면 트랜잭션 없이 반환 → 스레드별 연결을 열 때마다 커밋(data_version 변경)이 생기지 않음
+    if c.execute("PRAGMA user_version").fetchone()[0] != 0:
+        return
+    with _tx(c):
+        c.execute(_SCHEMA)
+        (ver,) = c.execute("PRAGMA user_version").fetchone()
+        if ver == 0:
+            d = today()
+            c.executemany(_INSERT.replace("INSERT", "INSERT OR REPLACE", 1), [_values(t, d) for t in _read_json_file() if _storable(t["id"])])
+            c.execute("PRAGMA user_version = 1")
+
+# 마이그레이션/테스트용: 전체 목록 읽기 / 전체 교체
 def load_todos() -> list[dict]:
-    if TODO_FILE.exists():
-        try:
-            with TODO_FILE.open("r", encoding="utf-8") as f:
-                return json.load(f)
-        except json.JSONDecodeError:
-            # 손상된 파일 방어
-            return []
-    return []
+    return _conn().execute(f"SELECT {_COLUMNS} FROM todos ORDER BY id").fetchall()
 
 def save_todos(todos: list[dict]) -> None:
-    with TODO_FILE.open("w", encoding="utf-8") as f:
-        json.dump(todos, f, ensure_ascii=False, indent=4)
+    c = _conn()
+    d = today()
+    with _tx(c):
+        c.execute("DELETE FROM todos")
+        c.executemany(_INSERT, [_values(t, d) for t in todos])
+
+def _select_todos(completed: Optional[bool], date: Optional[str]) -> list[dict]:
+    where, args = [], []
+    if completed is not None:
+        where.append("completed = ?")
+        args.append(int(completed))
+    if date is not None:
+        where.append("date = ?")
+        args.append(date)
+    sql = f"SELECT {_COLUMNS} FROM todos"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    return _conn().execute(sql + " ORDER BY id", args).fetchall()
+
+def _select_todo(todo_id: int) -> Optional[dict]:
+    if not _storable(todo_id):
+        return None
+    return _conn().execute(f"SELECT {_COLUMNS} FROM todos WHERE id = ?", (todo_id,)).fetchone()
+
+# --- HTTP caching (ETag) ---
+# ETag = 응답 본문(orjson bytes)의 xxh3 해시 → 내용이 같으면 재시작 후에도 같은 값
+# (path, query) 별로 마지막 (상태 토큰, etag, body)를 보관해 DB가 그대로면 조회/재직렬화/재해시 생략
+CACHE_CONTROL = "private, max-age=0, must-revalidate"
+_BODIES: dict[tuple[str, bytes], tuple[tuple, str, bytes]] = {}
+
+# data_version: 이 프로세스의 worker 스레드, 다른 프로세스, sqlite3 CLI 등 모든 연결의 커밋에 바뀜
+# 값은 확인용 연결마다 따로 세므로 연결을 다시 연 epoch도 함께 비교
+def state_token() -> tuple:
+    return (str(_db_file()), _STATE["epoch"], _data_version())
+
+# 요청당 한 번만 계산해 scope["state"]에 보관 (캐시 미들웨어와 엔드포인트가 공유)
+def request_token(scope) -> tuple:
+    state = scope.setdefault("state", {})
+    token = state.get("todo_token")
+    if token is None:
+        token = state["todo_token"] = state_token()
+    return token
+
+def _body_key(request: Request) -> tuple[str, bytes]:
+    return (request.scope["path"], request.scope["query_string"])
+
+def cached_body(request: Request, token: tuple) -> Optional[tuple[str, bytes]]:
+    hit = _BODIES.get(_body_key(request))
+    if hit is not None and hit[0] == token:
+        return hit[1], hit[2]
+    return None
+
+# token은 조회 전에 잡아 둔 값 → 조회 도중 커밋이 있었다면 다음 요청에서 다시 계산됨
+def remember_body(request: Request, content, token: tuple) -> tuple[str, bytes]:
+    body = orjson.dumps(content)
+    etag = f'"{xxhash.xxh3_64_hexdigest(body)}"'
+    if len(_BODIES) >= RESPONSE_CACHE_MAX:
+        _BODIES.clear()
+    _BODIES[_body_key(request)] = (token, etag, body)
+    return etag, body
+
+def etag_is_current(key: tuple[str, bytes], etag: str, token: tuple) -> bool:
+    hit = _BODIES.get(key)
+    return hit is not None and hit[0] == token and hit[1] == etag
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    inm = request.headers.get("if-none-match")
+    if inm is None:
+        return None
+    tags = {t.strip().removeprefix("W/") for t in inm.split(",")}
+    if etag in tags or "*" in tags:
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+    return None
+
+# --- Todo operations ---
+# 단건 엔드포인트와 /todos/batch가 공유. 호출 측이 연 트랜잭션 안에서 실행 (_write / _run_batch)
+# 반환: (상태 코드, 결과 dict 또는 오류 메시지)
+def _create(c: sqlite3.Connection, todo: TodoItem) -> tuple[int, object]:
+    d = _to_dict(todo)
+    try:
+        c.execute(_INSERT, _values(d, d["date"]))
+    except sqlite3.IntegrityError:
+        # 중복 id 방지 (PRIMARY KEY)
+        return 409, "Duplicate id"
+    return 200, d
+
+def _update(c: sqlite3.Connection, todo_id: int, updated_todo: TodoItem) -> tuple[int, object]:
+    if not _storable(todo_id):
+        return 404, NOT_FOUND_MSG
+    merged = _to_dict(updated_todo)
+    merged["id"] = todo_id  # URL 우선
+    cur = c.execute(
+        "UPDATE todos SET title = ?, description = ?, completed = ?, date = ? WHERE id = ?",
+        (merged["title"], merged["description"], int(merged["completed"]), merged["date"], todo_id),
+    )
+    if cur.rowcount == 0:
+        return 404, NOT_FOUND_MSG
+    return 200, merged
+
+def _delete(c: sqlite3.Connection, todo_id: int) -> tuple[int, object]:
+    if not _storable(todo_id) or c.execute("DELETE FROM todos WHERE id = ?", (todo_id,)).rowcount == 0:
+        return 404, NOT_FOUND_MSG
+    return 200, "To-Do item deleted"
+
+def _patch_date(c: sqlite3.Connection, todo_id: int, date: str) -> tuple[int, object]:
+    if not _storable(todo_id) or c.execute("UPDATE todos SET date = ? WHERE id = ?", (date, todo_id)).rowcount == 0:
+        return 404, NOT_FOUND_MSG
+    return 200, c.execute(f"SELECT {_COLUMNS} FROM todos WHERE id = ?", (todo_id,)).fetchone()
+
+def _write(op, *args) -> tuple[int, object]:
+    c = _conn()
+    with _tx(c):
+        return op(c, *args)
+
+# --- Pre-encoded bodies ---
+# 항상 같은 응답은 import 시 한 번만 직렬화
+_HEALTH_BYTES = orjson.dumps({"status": "ok"})
+_VERSION_BYTES = orjson.dumps({"version": APP_VERSION})
+_NOT_FOUND_BYTES = orjson.dumps({"detail": NOT_FOUND_MSG})
+
+# HTTPException과 같은 {"detail": ...} 형식의 오류 응답 (가장 흔한 404는 미리 만든 bytes 사용)
+def error_response(status: int, detail) -> Response:
+    body = _NOT_FOUND_BYTES if detail == NOT_FOUND_MSG else orjson.dumps({"detail": detail})
+    return Response(body, status_code=status, media_type="application/json")
 
 # --- Health/Version ---
 @app.get("/health")
-def health():
-    return {"status": "ok"}
+async def health():
+    return Response(_HEALTH_BYTES, media_type="application/json")
 
 @app.get("/version")
-def version():
-    return {"version": APP_VERSION}
+async def version():
+    return Response(_VERSION_BYTES, media_type="application/json")
 
 # --- CRUD + 필터 ---
-@app.get("/todos", response_model=List[TodoItem])
-def get_todos(
+# 조회 결과는 이미 저장된 dict이므로 response_model 재검증 없이 그대로 직렬화 (문서용 스키마만 유지)
+@app.get("/todos", response_model=None, responses={200: {"model": List[TodoItem]}})
+async def get_todos(
+    request: Request,
     completed: Optional[bool] = Query(default=None, description="완료 여부 필터"),
     date: Optional[str] = Query(default=None, description="YYYY-MM-DD 특정 날짜 필터")
 ):
-    todos = load_todos()
-    
-    # 날짜 없는 기존 항목은 TODAY로 간주해서 동작 일관성 확보
-    for t in todos:
-        if "date" not in t:
-            t["date"] = TODAY
+    token = request_token(request.scope)
+    memo = cached_body(request, token)
+    if memo is None:
+        todos = await asyncio.to_thread(_select_todos, completed, date)
+        memo = remember_body(request, todos, token)
+    etag, body = memo
+    # 변경이 없으면 본문 없이 304
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    return Response(body, media_type="application/json", headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
 
-    if completed is not None:
-        todos = [t for t in todos if bool(t.get("completed", False)) == completed]
-    if date is not None:
-        todos = [t for t in todos if t.get("date") == date]
-    return todos
-
-@app.post("/todos", response_model=TodoItem, status_code=200)
-def create_todo(todo: TodoItem):
-    todos = load_todos()
-    # 중복 id 방지
-    if any(t["id"] == todo.id for t in todos):
-        raise HTTPException(status_code=409, detail="Duplicate id")
-    todos.append(todo.model_dump())
-    save_todos(todos)
-    return todo
-
-@app.put("/todos/{todo_id}", response_model=TodoItem)
-def update_todo(todo_id: int, updated_todo: TodoItem):
-    todos = load_todos()
-    
-    for i, t in enumerate(todos):
-        if t["id"] == todo_id:
-            merged = updated_todo.model_dump()
-            merged["id"] = todo_id  # URL 우선
-            # date 필드 누락 방지(구버전 클라이언트 호환)
-            if not merged.get("date"):
-                merged["date"] = t.get("date", TODAY)
-            todos[i] = merged
-            save_todos(todos)
-            return merged
-    raise HTTPException(status_code=404, detail=NOT_FOUND_MSG)
+# 응답은 검증된 입력으로 만든 dict라 response_model 재검증을 생략 (문서용 스키마만 유지)
+@app.post("/todos", response_model=None, responses={200: {"model": TodoItem}}, status_code=200,
+          openapi_extra=json_body(TodoItem))
+async def create_todo(request: Request):
+    todo = await read_model(request, TodoItem)
+    status, result = await asyncio.to_thread(_write, _create, todo)
+    if status != 200:
+        return error_response(status, result)
+    return OrjsonResponse(result)
+
+@app.put("/todos/{todo_id}", response_model=None, responses={200: {"model": TodoItem}},
+         openapi_extra=json_body(TodoItem))
+async def update_todo(todo_id: int, request: Request):
+    updated_todo = await read_model(request, TodoItem)
+    status, result = await asyncio.to_thread(_write, _update, todo_id, updated_todo)
+    if status != 200:
+        return error_response(status, result)
+    return OrjsonResponse(result)
 
 @app.delete("/todos/{todo_id}", response_model=dict)
-def delete_todo(todo_id: int):
-    todos = load_todos()
-    new_todos = [t for t in todos if t["id"] != todo_id]
-    if len(new_todos) == len(todos):
-        raise HTTPException(status_code=404, detail=NOT_FOUND_MSG)
-    save_todos(new_todos)
-    return {"message": "To-Do item deleted"}
-
-# 단건 조회: 구데이터도 date 보장
-@app.get("/todos/{todo_id}", response_model=TodoItem)
-def get_todo(todo_id: int):
-    for t in load_todos():
-        if t["id"] == todo_id:
-            if "date" not in t:
-                t["date"] = TODAY
-            return t
-    raise HTTPException(status_code=404, detail=NOT_FOUND_MSG)
+async def delete_todo(todo_id: int):
+    status, result = await asyncio.to_thread(_write, _delete, todo_id)
+    if status != 200:
+        return error_response(status, result)
+    return {"message": result}
+
+# 단건 조회 (PRIMARY KEY 조회)
+@app.get("/todos/{todo_id}", response_model=None, responses={200: {"model": TodoItem}})
+async def get_todo(todo_id: int, request: Request):
+    token = request_token(request.scope)
+    memo = cached_body(request, token)
+    if memo is None:
+        t = await asyncio.to_thread(_select_todo, todo_id)
+        if t is None:
+            return error_response(404, NOT_FOUND_MSG)
+        memo = remember_body(request, t, token)
+    etag, body = memo
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    return Response(body, media_type="application/json", headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
 
 # --- HTML ---
+INDEX_CHECK_TTL = 1.0  # index.html 존재 여부를 다시 확인하는 간격(초)
+_INDEX_OK = {"path": None, "ok": False, "until": 0.0}
+
+def _index_exists() -> bool:
+    now = time.monotonic()
+    if _INDEX_OK["path"] != INDEX_HTML or now >= _INDEX_OK["until"]:
+        _INDEX_OK.update(path=INDEX_HTML, ok=INDEX_HTML.exists(), until=now + INDEX_CHECK_TTL)
+    return _INDEX_OK["ok"]
+
 @app.get("/", response_class=HTMLResponse)
-def read_root():
-    if not INDEX_HTML.exists():
+async def read_root():
+    if not _index_exists():
         return HTMLResponse("<h1>index.html not found</h1>", status_code=500)
-    return HTMLResponse(INDEX_HTML.read_text(encoding="utf-8"))
+    # 파일을 str로 읽지 않고 그대로 전송 (ETag/Last-Modified 헤더 자동 포함)
+    return FileResponse(INDEX_HTML, media_type="text/html", headers={"Cache-Control": "public, max-age=60"})
+
+class VersionHeaderMiddleware:
+    # 응답 시작 메시지에 X-App-Version 헤더만 덧붙이는 순수 ASGI 미들웨어
+    # (@app.middleware("http")의 BaseHTTPMiddleware 경유 비용 없음)
+    def __init__(self, app, version: str):
+        self.app = app
+        self.header = (b"x-app-version", version.encode())
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_version(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), self.header]
+            await send(message)
 
-@app.middleware("http")
-async def add_version_header(request: Request, call_next):
-    resp = await call_next(request)
-    resp.headers["X-App-Version"] = APP_VERSION
-    return resp
+        await self.app(scope, receive, send_with_version)
+
+app.add_middleware(VersionHeaderMiddleware, version=APP_VERSION)
 
 # --- Date ---
-@app.patch("/todos/{todo_id}/date", response_model=TodoItem)
-def update_todo_date(todo_id: int, payload: DateOnly):
-    todos = load_todos()
-    for i, t in enumerate(todos):
-        if t["id"] == todo_id:
-            # 구데이터 호환: 기본 필드 보존
-            if "date" not in t:
-                t["date"] = TODAY
-            t["date"] = payload.date
-            save_todos(todos)
-            # 응답도 TodoItem 스키마에 맞춰 반환
-            return t
-    raise HTTPException(status_code=404, detail=NOT_FOUND_MSG)
\ No newline at end of file
+# 응답은 DB 행(_row, 다섯 컬럼 모두 포함)이라 response_model 재검증 생략 (문서용 스키마만 유지)
+@app.patch("/todos/{todo_id}/date", response_model=None, responses={200: {"model": TodoItem}},
+           openapi_extra=json_body(DateOnly))
+async def update_todo_date(todo_id: int, request: Request):
+    payload = await read_model(request, DateOnly)
+    status, result = await asyncio.to_thread(_write, _patch_date, todo_id, payload.date)
+    if status != 200:
+        return error_response(status, result)
+    return OrjsonResponse(result)
+
+# --- Batch ---
+# data 검증 (id는 PUT과 같이 op.id 우선) → (TodoItem, None) 또는 (None, 오류 상세)
+def _op_item(op: BatchOp) -> tuple[Optional[TodoItem], object]:
+    if op.data is None:
+        return None, "data is required"
+    try:
+        return TodoItem.model_validate({**op.data, "id": op.id}), None
+    except ValidationError as e:
+        return None, [{**err, "loc": ("data", *err["loc"])} for err in e.errors(include_url=False, include_context=False)]
+
+# 여러 작업을 한 트랜잭션에서 순서대로 적용 (커밋 한 번)
+def _run_batch(ops: List[BatchOp]) -> list[dict]:
+    results = []
+    c = _conn()
+    with _tx(c):
+        for op in ops:
+            if op.op in ("create", "update"):
+                item, error = _op_item(op)
+                if item is None:
+                    status, result = 422, error
+                elif op.op == "create":
+                    status, result = _create(c, item)
+                else:
+                    status, result = _update(c, op.id, item)
+            elif op.op == "delete":
+                status, result = _delete(c, op.id)
+            elif op.date and _is_valid_date(op.date):
+                status, result = _patch_date(c, op.id, op.date)
+            else:
+                status, result = 422, "date must be YYYY-MM-DD"
+            entry = {"op": op.op, "id": op.id, "status": status}
+            if status != 200:
+                entry["detail"] = result
+            results.append(entry)
+    return results
+
+@app.post("/todos/batch", openapi_extra=json_body(BatchRequest))
+async def batch_todos(request: Request):
+    batch = await read_model(request, BatchRequest)
+    results = await asyncio.to_thread(_run_batch, batch.ops)
+    return OrjsonResponse({"results": results})
\ No newline at end of file
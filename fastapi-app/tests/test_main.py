@@ -8,6 +8,9 @@ import pytest
 from fastapi.testclient import TestClient
 import main  # import module to allow monkeypatching attributes
 import importlib
+import json
+import re
+import sqlite3
 from main import app, save_todos, load_todos, TodoItem
 
 client = TestClient(app)
@@ -129,6 +132,7 @@ def test_health_and_version():
     r1 = client.get("/health")
     assert r1.status_code == 200
     assert r1.json()["status"] == "ok"
+    assert r1.headers["x-app-version"] == main.APP_VERSION
 
     r2 = client.get("/version")
     assert r2.status_code == 200
@@ -143,6 +147,9 @@ def test_validator_empty_title_returns_422():
         "completed": False
     })
     assert r.status_code == 422
+    # FastAPI 기본 422와 같은 형식 (pydantic의 url 필드 없음)
+    assert [e["loc"] for e in r.json()["detail"]] == [["body", "title"]]
+    assert all("url" not in e for e in r.json()["detail"])
 
 def test_corrupted_json_returns_empty_list(monkeypatch, tmp_path):
     # 손상된 JSON 파일 준비
@@ -155,7 +162,7 @@ def test_corrupted_json_returns_empty_list(monkeypatch, tmp_path):
 
     r = local_client.get("/todos")
     assert r.status_code == 200
-    assert r.json() == []  # except json.JSONDecodeError -> return []
+    assert r.json() == []  # except orjson.JSONDecodeError -> return []
 
 def test_missing_file_returns_empty_list(monkeypatch, tmp_path):
     missing = tmp_path / "no_such.json"  # 존재하지 않음
@@ -184,4 +191,259 @@ def test_root_returns_content_when_index_exists(monkeypatch, tmp_path):
 
     r = client.get("/")
     assert r.status_code == 200
-    assert "<h1>Hello</h1>" in r.text
\ No newline at end of file
+    assert "<h1>Hello</h1>" in r.text
+    assert r.headers["content-type"].startswith("text/html")
+    assert r.headers["cache-control"] == "public, max-age=60"
+    assert "etag" in r.headers
+
+def test_storage_uses_sqlite_wal():
+    save_todos([TodoItem(id=1, title="A", description="a").model_dump()])
+    db = main.TODO_FILE.with_suffix(".db")
+    assert db.exists()
+    conn = sqlite3.connect(db)
+    try:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("SELECT id, title FROM todos").fetchall() == [(1, "A")]
+    finally:
+        conn.close()
+
+def test_delete_and_patch_keep_order_of_others():
+    items = [
+        TodoItem(id=i, title=f"T{i}", description="d", completed=False).model_dump()
+        for i in (1, 2, 3)
+    ]
+    save_todos(items)
+
+    assert client.delete("/todos/2").status_code == 200
+    r = client.patch("/todos/3/date", json={"date": "2025-01-02"})
+    assert r.status_code == 200
+    assert r.json()["date"] == "2025-01-02"
+
+    data = client.get("/todos").json()
+    assert [t["id"] for t in data] == [1, 3]
+    assert client.get("/todos/2").status_code == 404
+    assert client.patch("/todos/2/date", json={"date": "2025-01-02"}).status_code == 404
+
+def test_external_writes_invalidate_cached_gets():
+    save_todos([TodoItem(id=1, title="A", description="a").model_dump()])
+    assert [t["id"] for t in client.get("/todos").json()] == [1]
+    # 다른 연결(다른 프로세스, sqlite3 CLI 등)의 커밋도 다음 GET에 반영
+    conn = sqlite3.connect(main._db_file())
+    try:
+        with conn:
+            conn.execute("INSERT INTO todos VALUES (2, 'B', 'b', 0, '2025-01-01')")
+    finally:
+        conn.close()
+    assert [t["id"] for t in client.get("/todos").json()] == [1, 2]
+    assert client.get("/todos/2").json()["title"] == "B"
+
+def test_ids_outside_sqlite_range_are_not_found():
+    big = 2**70
+    assert client.get(f"/todos/{big}").status_code == 404
+    assert client.delete(f"/todos/{big}").status_code == 404
+    assert client.put(f"/todos/{big}", json={"id": 1, "title": "A", "description": "a"}).status_code == 404
+    assert client.patch(f"/todos/{big}/date", json={"date": "2025-01-01"}).status_code == 404
+    assert client.post("/todos", json={"id": big, "title": "A", "description": "a"}).status_code == 422
+
+def test_writes_persist_across_app_restart():
+    # with 블록 → lifespan 실행 (시작 시 DB 준비, 종료 시 연결 정리)
+    with TestClient(app) as c:
+        for i in range(1, 6):
+            r = c.post("/todos", json={"id": i, "title": f"T{i}", "description": "d"})
+            assert r.status_code == 200
+        assert len(c.get("/todos").json()) == 5
+    with TestClient(app) as c:
+        assert [t["id"] for t in c.get("/todos").json()] == [1, 2, 3, 4, 5]
+
+def test_json_is_imported_once(monkeypatch, tmp_path):
+    legacy = tmp_path / "legacy" / "todo.json"
+    legacy.parent.mkdir()
+    # date 없는 구데이터 포함
+    legacy.write_text(
+        '[{"id": 1, "title": "A", "description": "a", "completed": false},'
+        ' {"id": 2, "title": "B", "description": "b", "completed": true, "date": "2025-01-01"}]',
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(main, "TODO_FILE", legacy)
+
+    data = client.get("/todos").json()
+    assert [(t["id"], t["date"]) for t in data] == [(1, main.today()), (2, "2025-01-01")]
+
+    # 가져오기는 DB를 만들 때 한 번만 → 모두 지워도 JSON에서 다시 채우지 않음
+    client.delete("/todos/1")
+    client.delete("/todos/2")
+    main._close_all()
+    assert client.get("/todos").json() == []
+
+def test_failed_commit_is_rolled_back():
+    class FailingCommit:
+        # COMMIT만 실패시키는 연결 래퍼 (SQLITE_BUSY 등 흉내)
+        def __init__(self, conn):
+            self.conn = conn
+
+        @property
+        def in_transaction(self):
+            return self.conn.in_transaction
+
+        def execute(self, sql, *args):
+            if sql == "COMMIT":
+                raise sqlite3.OperationalError("database is locked")
+            return self.conn.execute(sql, *args)
+
+    c = main._conn()
+    with pytest.raises(sqlite3.OperationalError):
+        with main._tx(FailingCommit(c)):
+            c.execute(main._INSERT, (1, "A", "a", 0, "2025-01-01"))
+    # 트랜잭션이 남아 있지 않아 같은 연결로 계속 쓸 수 있음
+    assert not c.in_transaction
+    assert load_todos() == []
+    save_todos([TodoItem(id=2, title="B", description="b").model_dump()])
+    assert [t["id"] for t in load_todos()] == [2]
+
+def test_etag_returns_304_until_data_changes():
+    save_todos([TodoItem(id=1, title="A", description="a").model_dump()])
+    r = client.get("/todos")
+    etag = r.headers["etag"]
+    assert r.headers["cache-control"] == "private, max-age=0, must-revalidate"
+
+    r304 = client.get("/todos", headers={"If-None-Match": etag})
+    assert r304.status_code == 304
+    assert r304.content == b""
+    # ETag는 본문 해시 → 단건 조회는 다른 ETag
+    one = client.get("/todos/1")
+    assert one.headers["etag"] != etag
+    assert client.get("/todos/1", headers={"If-None-Match": one.headers["etag"]}).status_code == 304
+
+    # 변경 후에는 새 ETag와 본문
+    client.patch("/todos/1/date", json={"date": "2025-01-02"})
+    r2 = client.get("/todos", headers={"If-None-Match": etag})
+    assert r2.status_code == 200
+    assert r2.headers["etag"] != etag
+
+    # 내용이 원래대로 돌아오면 ETag도 같아짐 (내용 기반)
+    client.patch("/todos/1/date", json={"date": r.json()[0]["date"]})
+    assert client.get("/todos", headers={"If-None-Match": etag}).status_code == 304
+
+def test_todo_gets_are_served_from_response_cache(monkeypatch):
+    save_todos([TodoItem(id=1, title="A", description="a").model_dump()])
+    calls = []
+    real_select = main._select_todos
+
+    def spy(*args):
+        calls.append(1)
+        return real_select(*args)
+    monkeypatch.setattr(main, "_select_todos", spy)
+
+    first = client.get("/todos?completed=false")
+    second = client.get("/todos?completed=false")
+    assert second.status_code == 200
+    assert second.content == first.content
+    assert second.headers["x-app-version"] == main.APP_VERSION
+    # 두 번째 요청은 캐시 hit → 엔드포인트를 거치지 않음
+    assert len(calls) == 1
+
+    # 쓰기 후에는 캐시가 무효화되어 새 데이터
+    client.put("/todos/1", json={"id": 1, "title": "B", "description": "a"})
+    assert client.get("/todos?completed=false").json()[0]["title"] == "B"
+
+def test_response_cache_keeps_all_body_chunks(monkeypatch):
+    # 본문을 두 조각으로 보내는 앱 → 캐시 hit에서도 전체 본문이 재생되어야 함
+    calls = []
+
+    async def chunked(scope, receive, send):
+        calls.append(1)
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"etag", b'"x"')]})
+        await send({"type": "http.response.body", "body": b"[1,", "more_body": True})
+        await send({"type": "http.response.body", "body": b"2]"})
+
+    monkeypatch.setattr(main, "etag_is_current", lambda *args: True)
+    c = TestClient(main.TodoCacheMiddleware(chunked))
+    assert c.get("/todos").content == b"[1,2]"
+    assert c.get("/todos").content == b"[1,2]"
+    assert len(calls) == 1
+
+def test_state_token_is_computed_once_per_request(monkeypatch):
+    save_todos([TodoItem(id=1, title="A", description="a").model_dump()])
+    with TestClient(app) as c:
+        # lifespan에서 DB 준비 후 확인용 연결이 열려 있음
+        assert main._PROBE["key"] == (str(main._db_file()), main._STATE["epoch"])
+        calls = []
+        real = main._data_version
+
+        def spy():
+            calls.append(1)
+            return real()
+        monkeypatch.setattr(main, "_data_version", spy)
+
+        c.get("/todos")  # miss: 미들웨어 → 엔드포인트
+        c.get("/todos")  # hit: 미들웨어만
+        c.get("/todos/1", headers={"If-None-Match": '"x"'})  # 조건부 요청: 엔드포인트만
+        assert len(calls) == 3
+
+def test_invalid_dates_return_422():
+    save_todos([TodoItem(id=1, title="A", description="a").model_dump()])
+    for bad in ("2025-13-01", "2025-02-30", "2025-1-2", "20250102", "not-a-date"):
+        r = client.patch("/todos/1/date", json={"date": bad})
+        assert r.status_code == 422, bad
+    assert client.post("/todos", json={"id": 2, "title": "B", "description": "b", "date": "2025-02-29"}).status_code == 422
+    assert client.patch("/todos/1/date", json={"date": "2024-02-29"}).status_code == 200
+
+def test_filter_completed_and_date_together():
+    save_todos([
+        TodoItem(id=1, title="A", description="a", completed=True, date="2025-01-01").model_dump(),
+        TodoItem(id=2, title="B", description="b", completed=False, date="2025-01-01").model_dump(),
+        TodoItem(id=3, title="C", description="c", completed=True, date="2025-01-02").model_dump(),
+    ])
+    r = client.get("/todos?completed=true&date=2025-01-01")
+    assert [t["id"] for t in r.json()] == [1]
+    r = client.get("/todos?date=2025-01-02")
+    assert [t["id"] for t in r.json()] == [3]
+
+def test_invalid_json_body_returns_422():
+    r = client.post("/todos", content=b"{not json", headers={"Content-Type": "application/json"})
+    assert r.status_code == 422
+    assert r.json()["detail"][0]["type"] == "json_invalid"
+
+    r = client.post("/todos", json={"id": 1, "title": "A"})
+    assert r.status_code == 422
+    assert r.json()["detail"][0]["loc"] == ["body", "description"]
+
+def test_batch_applies_ops_in_order_with_per_op_status():
+    save_todos([TodoItem(id=1, title="A", description="a").model_dump()])
+    r = client.post("/todos/batch", json={"ops": [
+        {"op": "create", "id": 2, "data": {"id": 2, "title": "B", "description": "b"}},
+        {"op": "create", "id": 1, "data": {"id": 1, "title": "dup", "description": "x"}},
+        {"op": "update", "id": 2, "data": {"id": 2, "title": "B2", "description": "b", "completed": True}},
+        {"op": "patch_date", "id": 1, "date": "2025-03-04"},
+        {"op": "patch_date", "id": 1, "date": "2025-3-4"},
+        {"op": "delete", "id": 99},
+        {"op": "delete", "id": 1},
+    ]})
+    assert r.status_code == 200
+    assert [x["status"] for x in r.json()["results"]] == [200, 409, 200, 200, 422, 404, 200]
+
+    data = client.get("/todos").json()
+    assert [(t["id"], t["title"], t["completed"]) for t in data] == [(2, "B2", True)]
+    assert [t["id"] for t in load_todos()] == [2]
+
+def test_batch_validates_data_per_op_and_uses_op_id():
+    r = client.post("/todos/batch", json={"ops": [
+        {"op": "create", "id": 5, "data": {"id": 7, "title": "A", "description": "a"}},
+        {"op": "create", "id": 6, "data": {"id": 6, "title": " ", "description": "b"}},
+        {"op": "update", "id": 5, "data": {"title": "A2", "description": "a", "date": "2025-13-01"}},
+        {"op": "update", "id": 5},
+    ]})
+    assert r.status_code == 200
+    results = r.json()["results"]
+    assert [(x["id"], x["status"]) for x in results] == [(5, 200), (6, 422), (5, 422), (5, 422)]
+    # 잘못된 data는 해당 작업만 실패 (FastAPI 422와 같은 오류 목록)
+    assert results[1]["detail"][0]["loc"] == ["data", "title"]
+    assert results[2]["detail"][0]["loc"] == ["data", "date"]
+    # 결과에 보고한 id(op.id)로 생성됨
+    assert [(t["id"], t["title"]) for t in load_todos()] == [(5, "A")]
+
+def test_openapi_body_refs_resolve():
+    schema = client.get("/openapi.json").json()
+    refs = re.findall(r'"\$ref": "#/components/schemas/([^"]+)"', json.dumps(schema))
+    assert "BatchOp" in refs
+    assert set(refs) <= set(schema["components"]["schemas"])